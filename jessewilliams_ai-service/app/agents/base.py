@@ -0,0 +1,73 @@
+"""Base Agent - Shared completion flow for the specialist agents"""
+
+import logging
+import random
+from itertools import cycle
+from typing import AsyncIterator, Dict, List, Tuple
+from app.core.openai_client import client
+from app.prompts.core_prompt import CORE_SYSTEM_INSTRUCTIONS, build_context_cached
+from app.utils.formatters import ResponseFormatter
+
+logger = logging.getLogger(__name__)
+
+GENERIC_PREFIXES = ("Understood", "Got it", "Perfect", "Acknowledged")
+
+# Request parameters shared by every agent's chat completion
+COMPLETION_PARAMS = {"model": "gpt-5.2", "temperature": 0.7, "max_completion_tokens": 2500}
+
+def replace_generic_opener(text: str, greeting: str) -> str:
+    """Swap a generic opening acknowledgment for a varied greeting"""
+    for generic in GENERIC_PREFIXES:
+        if text.startswith(generic):
+            return greeting + text[len(generic):]
+    return text
+
+async def stream_completion(messages: List[Dict]) -> AsyncIterator[str]:
+    """Stream a chat completion, yielding its non-empty content deltas"""
+    stream = await client.chat.completions.create(messages=messages, stream=True, **COMPLETION_PARAMS)
+    async for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+async def complete(messages: List[Dict]) -> str:
+    """Stream a chat completion and join the deltas once"""
+    return "".join([delta async for delta in stream_completion(messages)])
+
+class BaseAgent:
+    """Single-turn agent: system prompt + user message -> one completion"""
+    
+    NAME: str = "Base"
+    PROMPT: str = ""
+    GREETINGS: Tuple[str, ...] = ("On it!",)
+    
+    def __init__(self):
+        self.formatter = ResponseFormatter()
+        # Shuffled once, then rotated per request
+        self._greeting_cycle = cycle(random.sample(self.GREETINGS, len(self.GREETINGS)))
+        logger.info("%s Agent Ready", self.NAME)
+    
+    def _system_prompt(self, user_profile: dict = None) -> str:
+        """Core instructions + profile context + agent prompt"""
+        context = build_context_cached(user_profile)
+        return f"{CORE_SYSTEM_INSTRUCTIONS}\n\n{context}\n\n{self.PROMPT}"
+    
+    async def process_message(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        user_profile: dict = None
+    ) -> str:
+        """Process a request with the agent's prompt"""
+        greeting = next(self._greeting_cycle)
+        return await self._call_openai(self._system_prompt(user_profile), message, greeting)
+    
+    async def _call_openai(self, system_prompt: str, message: str, greeting: str) -> str:
+        """Stream the completion, join it once and replace a generic opener"""
+        text = await complete([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": message}
+        ])
+        return replace_generic_opener(text, greeting)
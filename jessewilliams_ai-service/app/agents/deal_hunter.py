@@ -2,16 +2,23 @@
 Deal Hunter Agent - With Search Result Storage for File Generation
 """
 
-import os
-from typing import Optional
-from openai import OpenAI
-from app.prompts.core_prompt import CORE_SYSTEM_INSTRUCTIONS, build_context
+import asyncio
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from app.agents.base import GENERIC_PREFIXES, complete, replace_generic_opener, stream_completion
+from app.prompts.core_prompt import CORE_SYSTEM_INSTRUCTIONS, build_context_cached
 from app.prompts.deal_hunter_prompt import DEAL_HUNTER
 from app.prompts.underwriting_prompt import UNDERWRITING_PROMPT
 from app.prompts.offer_outreach_prompt import OFFER_OUTREACH_PROMPT
 from app.core.intent_classifier import IntentClassifier
 from app.core.context import ContextManager
 from app.utils.formatters import ResponseFormatter
+from app.utils.stream_buffer import StreamBuffer
+
+logger = logging.getLogger(__name__)
 
 # Import web search
 try:
@@ -19,9 +26,64 @@ try:
     WEB_SEARCH_AVAILABLE = True
 except ImportError:
     WEB_SEARCH_AVAILABLE = False
-    print("⚠️ Web search module not available")
+    logger.warning("Web search module not available")
+
+_GENERIC_PREFIX_MAX_LEN = max(len(p) for p in GENERIC_PREFIXES)
+
+# Single-word search triggers match at the start of any word so every inflection
+# counts ("listed", "finds", "searched"), plus multi-word phrases
+_SEARCH_STEM_RE = re.compile(r"\b(?:find|search|show|list|available|current)")
+_SEARCH_PHRASES = (
+    'what properties', 'what deals', 'what listings', 'real estate in',
+    'properties in', 'land in', 'homes in'
+)
+
+SSE_DONE = "data: [DONE]\n\n"
+
+def _sse_frame(content: str) -> str:
+    return f"data: {json.dumps({'content': content})}\n\n"
+
+INTENT_PROMPTS = {
+    'deal_hunter': DEAL_HUNTER,
+    'underwriting_analyzer': UNDERWRITING_PROMPT,
+    'offer_outreach': OFFER_OUTREACH_PROMPT
+}
+
+ANTI_HALLUCINATION = """
+
+# CRITICAL: ANTI-HALLUCINATION RULES
+
+1. **NEVER INVENT DATA**: Do not create property addresses, prices, or listings
+2. **USE ONLY PROVIDED DATA**: Only use information from user profile, conversation history, or web search results
+3. **ACKNOWLEDGE LIMITATIONS**: If you don't have specific data, say "I can search for current listings in [location]"
+4. **NO ASSUMPTIONS**: Do not assume property details, market conditions, or specific opportunities
+5. **CITE SOURCES**: When using web search results, always include source URLs as hyperlinks
+
+## What to Do Instead:
+- Provide STRATEGY frameworks (how to find deals)
+- Explain FORMULAS and CALCULATIONS (70% rule, cap rate formulas)
+- Describe PROCESSES (how to wholesale, how to analyze)
+- Offer to SEARCH for actual listings when ready
+
+## Citing Web Search Results:
+When using search results, format like this:
+"According to [Zillow](url), there are X properties available..."
+"Based on search results, the average price is..."
+
+## File Generation Support:
+When user requests spreadsheets, documents, or files:
+- Process the request normally
+- Include all relevant data in your response
+- The system will automatically generate downloadable files
+- Mention: "I'll generate that file for you now."
+"""
+
+@lru_cache(maxsize=8)
+def _render_static_prompt(intent: str) -> Tuple[str, str]:
+    """Static prompt halves for an intent, split where the profile context goes"""
+    base = INTENT_PROMPTS.get(intent, DEAL_HUNTER)
+    return f"{CORE_SYSTEM_INSTRUCTIONS}\n\n", f"\n\n{base}\n\n{ANTI_HALLUCINATION}"
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class DealHunterAgent:
     """Enhanced Deal Hunter with search result storage"""
@@ -33,10 +95,15 @@ class DealHunterAgent:
         
         if WEB_SEARCH_AVAILABLE:
             self.search_client = GoogleCSEPropertySearch()
-            print("✅ Deal Hunter Agent (Memory + Web Search) - Ready")
+            logger.info("Deal Hunter Agent (Memory + Web Search) - Ready")
         else:
             self.search_client = None
-            print("✅ Deal Hunter Agent (Memory Only) - Ready")
+            logger.info("Deal Hunter Agent (Memory Only) - Ready")
+    
+    async def close(self):
+        """Release the search client's HTTP session"""
+        if self.search_client is not None:
+            await self.search_client.close()
     
     def _get_greeting_response(self) -> str:
         """Generate appropriate greeting response"""
@@ -64,179 +131,164 @@ Please reply with **1**, **2**, or **3** to continue.
     
     def _get_system_prompt(self, intent: str, profile: dict) -> str:
         """Build full system prompt with context"""
-        context = build_context(profile) if profile else ""
-        
-        prompts = {
-            'deal_hunter': DEAL_HUNTER,
-            'underwriting_analyzer': UNDERWRITING_PROMPT,
-            'offer_outreach': OFFER_OUTREACH_PROMPT
-        }
-        
-        base = prompts.get(intent, DEAL_HUNTER)
-        
-        anti_hallucination = """
-
-# CRITICAL: ANTI-HALLUCINATION RULES
-
-1. **NEVER INVENT DATA**: Do not create property addresses, prices, or listings
-2. **USE ONLY PROVIDED DATA**: Only use information from user profile, conversation history, or web search results
-3. **ACKNOWLEDGE LIMITATIONS**: If you don't have specific data, say "I can search for current listings in [location]"
-4. **NO ASSUMPTIONS**: Do not assume property details, market conditions, or specific opportunities
-5. **CITE SOURCES**: When using web search results, always include source URLs as hyperlinks
-
-## What to Do Instead:
-- Provide STRATEGY frameworks (how to find deals)
-- Explain FORMULAS and CALCULATIONS (70% rule, cap rate formulas)
-- Describe PROCESSES (how to wholesale, how to analyze)
-- Offer to SEARCH for actual listings when ready
-
-## Citing Web Search Results:
-When using search results, format like this:
-"According to [Zillow](url), there are X properties available..."
-"Based on search results, the average price is..."
-
-## File Generation Support:
-When user requests spreadsheets, documents, or files:
-- Process the request normally
-- Include all relevant data in your response
-- The system will automatically generate downloadable files
-- Mention: "I'll generate that file for you now."
-"""
-        
-        return f"{CORE_SYSTEM_INSTRUCTIONS}\n\n{context}\n\n{base}\n\n{anti_hallucination}"
+        head, tail = _render_static_prompt(intent)
+        return f"{head}{build_context_cached(profile)}{tail}"
     
     def _should_search(self, message: str) -> bool:
         """Determine if web search is needed"""
-        search_triggers = [
-            'find', 'search', 'show', 'list', 'available',
-            'current', 'what properties', 'what deals',
-            'what listings', 'real estate in', 'properties in',
-            'land in', 'homes in'
-        ]
-        return any(trigger in message.lower() for trigger in search_triggers)
+        message_lower = message.lower()
+        if _SEARCH_STEM_RE.search(message_lower):
+            return True
+        return any(phrase in message_lower for phrase in _SEARCH_PHRASES)
     
-    async def process_message(
+    def _load_context(self, user_id: str, session_id: str) -> Tuple[str, List[Dict]]:
+        """Full context string plus the recent turns sent to the model"""
+        return (
+            self.context_manager.get_full_context(user_id, session_id),
+            self.context_manager.get_recent_history(user_id, session_id, 8)
+        )
+    
+    async def _search_listings(
+        self,
+        user_id: str,
+        session_id: str,
+        user_profile: dict = None
+    ) -> Optional[List[Dict]]:
+        """Run the property search for this session and store the results"""
+        search_results = None
+        
+        session = self.context_manager.get_session(user_id, session_id)
+        if session is not None:
+            extracted = session.extracted_data
+            
+            location = extracted.get("location") or (user_profile.get("targetGeography") if user_profile else None)
+            capital = extracted.get("capital") or (user_profile.get("startingCapital") if user_profile else None)
+            
+            if location:
+                try:
+                    property_type = user_profile.get("propertyType", "land").lower() if user_profile else "land"
+                    
+                    search_results = await self.search_client.search_properties(
+                        location=location,
+                        property_type=property_type,
+                        max_price=int(capital) if capital else None
+                    )
+                    
+                    logger.debug("Found %d properties", len(search_results))
+                    
+                    # IMPORTANT: Store search results in session context
+                    if search_results:
+                        self.context_manager.store_search_results(
+                            user_id,
+                            session_id,
+                            search_results
+                        )
+                    
+                except Exception as e:
+                    logger.exception("Search error: %s", e)
+            else:
+                logger.debug("No location found - skipping search")
+        
+        return search_results
+    
+    async def _build_messages(
         self,
         user_id: str,
         session_id: str,
         message: str,
         user_profile: dict = None
-    ) -> str:
-        """Process with search result storage"""
+    ) -> Optional[List[Dict]]:
+        """
+        Store the user turn, run search if needed and assemble the chat payload
+        
+        Returns None when the message was a greeting (already answered)
+        """
         
         # Store user message
         self.context_manager.add_message(user_id, session_id, "user", message)
         
         # Classify intent
         intent, confidence, meta = self.classifier.classify(message)
-        print(f"🎯 Intent: {intent} ({confidence:.2f})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Intent: %s (%.2f)", intent, confidence)
         
         # Handle greeting
         if intent == 'greeting':
-            print("👋 Greeting detected")
-            response = self._get_greeting_response()
-            self.context_manager.add_message(user_id, session_id, "assistant", response)
-            return response
+            logger.debug("Greeting detected")
+            self.context_manager.add_message(user_id, session_id, "assistant", self._get_greeting_response())
+            return None
         
         # Check if web search needed
-        search_results = None
         if self.search_client and self._should_search(message):
-            print("🔍 Web search triggered")
+            logger.debug("Web search triggered")
             
-            user_context = self.context_manager.get_user_context(user_id)
-            if user_context:
-                session = user_context.get("sessions", {}).get(session_id, {})
-                extracted = session.get("extracted_data", {})
-                
-                location = extracted.get("location") or (user_profile.get("targetGeography") if user_profile else None)
-                capital = extracted.get("capital") or (user_profile.get("startingCapital") if user_profile else None)
-                
-                if location:
-                    try:
-                        property_type = user_profile.get("propertyType", "land").lower() if user_profile else "land"
-                        
-                        search_results = await self.search_client.search_properties(
-                            location=location,
-                            property_type=property_type,
-                            max_price=int(capital) if capital else None
-                        )
-                        
-                        print(f"✅ Found {len(search_results)} properties")
-                        
-                        # IMPORTANT: Store search results in session context
-                        if search_results:
-                            self.context_manager.store_search_results(
-                                user_id,
-                                session_id,
-                                search_results
-                            )
-                        
-                    except Exception as e:
-                        print(f"❌ Search error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                else:
-                    print("⚠️ No location found - skipping search")
-        
-        # Get FULL context
-        full_context = self.context_manager.get_full_context(user_id, session_id)
+            # Load context in a worker thread while the search is in flight
+            search_results, (full_context, history) = await asyncio.gather(
+                self._search_listings(user_id, session_id, user_profile),
+                asyncio.to_thread(self._load_context, user_id, session_id)
+            )
+        else:
+            search_results = None
+            full_context, history = self._load_context(user_id, session_id)
         
         # Add search results to context
         if search_results:
-            search_context = "\n\n# REAL WEB SEARCH RESULTS (USE THESE)\n\n"
+            parts = ["\n\n# REAL WEB SEARCH RESULTS (USE THESE)\n\n"]
             for i, result in enumerate(search_results[:10], 1):
-                search_context += f"{i}. **{result['address']}**\n"
-                search_context += f"   - Price: ${result['price']:,}\n"
-                search_context += f"   - Type: {result.get('property_type', 'N/A')}\n"
-                search_context += f"   - Source: [{result['source']}]({result['source_url']})\n"
+                parts.append(f"{i}. **{result['address']}**\n")
+                parts.append(f"   - Price: ${result['price']:,}\n")
+                parts.append(f"   - Type: {result.get('property_type', 'N/A')}\n")
+                parts.append(f"   - Source: [{result['source']}]({result['source_url']})\n")
                 if result.get('lot_size'):
-                    search_context += f"   - Lot Size: {result['lot_size']}\n"
+                    parts.append(f"   - Lot Size: {result['lot_size']}\n")
                 if result.get('sqft'):
-                    search_context += f"   - Sq Ft: {result['sqft']:,}\n"
+                    parts.append(f"   - Sq Ft: {result['sqft']:,}\n")
                 if result.get('bedrooms'):
-                    search_context += f"   - Beds/Baths: {result['bedrooms']}/{result['bathrooms']}\n"
+                    parts.append(f"   - Beds/Baths: {result['bedrooms']}/{result['bathrooms']}\n")
                 if result.get('is_sample'):
-                    search_context += f"   - NOTE: Sample data (API unavailable)\n"
-                search_context += "\n"
+                    parts.append(f"   - NOTE: Sample data (API unavailable)\n")
+                parts.append("\n")
             
-            search_context += "**CRITICAL**: Use ONLY these properties. Include source URLs.\n"
-            full_context += search_context
+            parts.append("**CRITICAL**: Use ONLY these properties. Include source URLs.\n")
+            full_context += "".join(parts)
         
         # Build prompt
         system_prompt = self._get_system_prompt(intent, user_profile)
         complete_system_prompt = f"{system_prompt}\n\n{full_context}"
         
-        print(f"📝 Context: {len(full_context)} chars | Search: {len(search_results) if search_results else 0}")
-        print(f"🧠 Sending to GPT-5.2...")
-        
-        # Get greeting
-        greeting = self.formatter.get_greeting()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Context: %d chars | Search: %d | Sending to GPT-5.2",
+                len(full_context), len(search_results) if search_results else 0
+            )
         
-        # Call OpenAI
-        history = self.context_manager.get_session_history(user_id, session_id)
+        # Recent turns for the model (already {"role", "content"} dicts)
         messages = [{"role": "system", "content": complete_system_prompt}]
+        messages.extend(history)
         
-        for msg in history[-8:]:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        return messages
+    
+    async def process_message(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        user_profile: dict = None
+    ) -> str:
+        """Process with search result storage"""
+        
+        messages = await self._build_messages(user_id, session_id, message, user_profile)
+        if messages is None:
+            return self._get_greeting_response()
+        
+        # Get greeting
+        greeting = self.formatter.get_greeting()
         
         try:
-            response = client.chat.completions.create(
-                model="gpt-5.2",
-                messages=messages,
-                temperature=0.7,
-                max_completion_tokens=2500
-            )
-            
-            ai_response = response.choices[0].message.content
+            ai_response = await complete(messages)
             
             # Replace generic greeting
-            for generic in ["Understood", "Got it", "Perfect", "Acknowledged"]:
-                if ai_response.startswith(generic):
-                    ai_response = ai_response.replace(generic, greeting, 1)
-                    break
+            ai_response = replace_generic_opener(ai_response, greeting)
             
             # Store response
             self.context_manager.add_message(user_id, session_id, "assistant", ai_response)
@@ -244,7 +296,66 @@ When user requests spreadsheets, documents, or files:
             return ai_response
             
         except Exception as e:
-            print(f"❌ OpenAI Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return f"I encountered an error: {str(e)}"
\ No newline at end of file
+            logger.exception("OpenAI error: %s", e)
+            return f"I encountered an error: {str(e)}"
+    
+    async def process_message_stream(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        user_profile: dict = None
+    ) -> AsyncIterator[str]:
+        """Process like process_message, yielding the response as SSE frames"""
+        
+        messages = await self._build_messages(user_id, session_id, message, user_profile)
+        if messages is None:
+            yield _sse_frame(self._get_greeting_response())
+            yield SSE_DONE
+            return
+        
+        greeting = self.formatter.get_greeting()
+        
+        # Emitted text; the opening is held back until the generic prefix can be checked
+        chunks = []
+        pending = []
+        # Batch frames: flush at 8KB or every 25ms
+        buffer = StreamBuffer(max_size=8192, flush_interval=0.025)
+        error_text = None
+        
+        try:
+            async for delta in stream_completion(messages):
+                if pending is not None:
+                    pending.append(delta)
+                    opening = "".join(pending)
+                    if len(opening) < _GENERIC_PREFIX_MAX_LEN:
+                        continue
+                    delta = replace_generic_opener(opening, greeting)
+                    pending = None
+                
+                chunks.append(delta)
+                batch = buffer.add(delta)
+                if batch:
+                    yield _sse_frame(batch)
+        
+        except Exception as e:
+            logger.exception("OpenAI error: %s", e)
+            error_text = f"I encountered an error: {str(e)}"
+        
+        # Release the held-back opening, also when the stream failed before it filled up
+        if pending:
+            delta = replace_generic_opener("".join(pending), greeting)
+            chunks.append(delta)
+            buffer.add(delta)
+        
+        remainder = buffer.flush()
+        if remainder:
+            yield _sse_frame(remainder)
+        # The error goes to the client as its own frame but never into history
+        if error_text:
+            yield _sse_frame(error_text)
+        yield SSE_DONE
+        
+        # Store response
+        if chunks:
+            self.context_manager.add_message(user_id, session_id, "assistant", "".join(chunks))
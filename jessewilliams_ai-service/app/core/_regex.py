@@ -0,0 +1,73 @@
+"""
+Multi-pattern regex backend
+Prefers Hyperscan (SIMD, all patterns in one scan) and falls back to stdlib re
+"""
+
+import re
+from typing import List, Set
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# ASCII characters Python's \s matches but Hyperscan's doesn't (\x1c-\x1f)
+_PY_ONLY_SPACE_RE = re.compile(r'[\x1c-\x1f]')
+
+class MultiPattern:
+    """
+    Reports which patterns occur anywhere in a text (re.search semantics, case-insensitive)
+    
+    Hyperscan scans bytes, where ., \s and case folding only agree with re on ASCII,
+    so any other text goes through the fused stdlib regex instead.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._db = self._compile_hyperscan(self.patterns) if HYPERSCAN_AVAILABLE else None
+        self._fused = self._compile_fused(self.patterns)
+    
+    @staticmethod
+    def _compile_hyperscan(patterns: List[str]):
+        """Block-mode database reporting each pattern id at most once"""
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[p.encode() for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            )
+            return db
+        except hyperscan.error:
+            # Pattern outside Hyperscan's supported syntax - use stdlib re
+            return None
+    
+    @staticmethod
+    def _compile_fused(patterns: List[str]) -> "re.Pattern":
+        """
+        Fuse the patterns into one regex evaluated with a single match()
+        
+        Each pattern sits in an optional lookahead anchored at the start, so group
+        p<i> is set exactly when pattern i would be found by re.search - alternatives
+        can't shadow each other the way a plain (a|b|c) alternation would.
+        """
+        return re.compile(
+            ''.join(rf'(?:(?=[\s\S]*?(?P<p{i}>{pattern})))?' for i, pattern in enumerate(patterns)),
+            re.IGNORECASE
+        )
+    
+    def matches(self, text: str) -> Set[int]:
+        """Indices of the patterns found in text"""
+        if self._db is not None and text.isascii() and not _PY_ONLY_SPACE_RE.search(text):
+            hits = set()
+            
+            def on_match(pattern_id, start, end, flags, context):
+                hits.add(pattern_id)
+            
+            self._db.scan(text.encode(), match_event_handler=on_match)
+            return hits
+        
+        found = self._fused.match(text)
+        return {i for i in range(len(self.patterns)) if found.group(f'p{i}') is not None}
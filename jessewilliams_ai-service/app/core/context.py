@@ -1,197 +1,347 @@
 """Context Manager with Search Result Storage"""
 
-from typing import Dict, Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
 import json
+import logging
+import re
+import threading
+from time import time_ns
+
+logger = logging.getLogger(__name__)
+
+_CAPITAL_RE = re.compile(r'\$?(\d{1,3}(?:,?\d{3})*(?:\.\d{2})?)\s*(?:k|thousand)?', re.IGNORECASE)
+_TIMELINE_RE = re.compile(r'(\d+)\s*(month|year|week)', re.IGNORECASE)
+_PROFIT_RE = re.compile(r'profit.*?\$?(\d{1,3}(?:,?\d{3})*)', re.IGNORECASE)
+
+# Location keyword plus up to two words either side, in a single scan
+_LOCATION_RE = re.compile(
+    r'(?:\S+\s+){0,2}\S*(?:(?i:county|city|near|around)|\b(?:SC|TX|FL|CA|GA)\b)\S*(?:\s+\S+){0,2}'
+)
+
+# Strips '$' and ',' in a single pass
+_CURRENCY_TABLE = str.maketrans("", "", "$,")
+
+# Profile section, rendered once per profile version
+_PROFILE_TEMPLATE = "\n".join([
+    "# USER PROFILE",
+    "- Property Type: {propertyType}",
+    "- Strategy: {strategy}",
+    "- Starting Capital: ${capital:,.2f}",
+    "- Target Geography: {targetGeography}",
+    "- Timeline: {investmentTimeline}",
+    "- Profit Goal: ${profit:,.2f}",
+    "",
+])
+
+_CONTEXT_INSTRUCTIONS = "\n".join([
+    "# INSTRUCTIONS",
+    "- USE PROVIDED DATA ONLY",
+    "- DO NOT INVENT ADDRESSES OR PRICES",
+    "- CITE SOURCES FOR SEARCH RESULTS",
+    "- REMEMBER ALL CONVERSATION CONTEXT",
+])
+
+def _fmt_ts(ns: int) -> str:
+    """Format a time_ns() timestamp as UTC ISO-8601 (only when serializing)"""
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+@dataclass(slots=True)
+class Session:
+    """One chat session; messages are stored column-wise (same index per message)"""
+    agent_type: str
+    roles: deque
+    contents: deque
+    timestamps: deque
+    created_at: int
+    extracted_data: Dict = field(default_factory=dict)
+    last_search_results: Optional[List[Dict]] = None
+    version: int = 0
+    context_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
+@dataclass(slots=True)
+class UserContext:
+    """A user's onboarding profile and their sessions"""
+    created_at: int
+    profile: Dict = field(default_factory=dict)
+    sessions: Dict[str, Session] = field(default_factory=dict)
+    version: int = 0
+    profile_cache: Optional[Tuple[int, str]] = None
 
 class ContextManager:
     """Manages user profiles, sessions, and search results"""
     
+    # Memory bounds: least recently used users are evicted, old messages roll off
+    MAX_USERS = 10000
+    MAX_MESSAGES = 200
+    
     def __init__(self):
-        self.contexts: Dict[str, Dict] = {}
+        self.contexts: "OrderedDict[str, UserContext]" = OrderedDict()
+        # Guards mutations and the reads that agents run off the event loop
+        self._lock = threading.RLock()
+        # Flat (user_id, session_id) index over the per-user "sessions" dicts
+        self.sessions: Dict[Tuple[str, str], Session] = {}
     
     def _ensure_numeric(self, value) -> float:
         """Convert string numbers to float"""
+        if type(value) is float:
+            return value
         if value is None:
             return 0.0
         if isinstance(value, (int, float)):
             return float(value)
         if isinstance(value, str):
             try:
-                clean = value.replace('$', '').replace(',', '').strip()
+                clean = value.translate(_CURRENCY_TABLE).strip()
                 return float(clean) if clean else 0.0
-            except (ValueError, AttributeError):
+            except ValueError:
                 return 0.0
         return 0.0
     
     def set_user_context(self, user_id: str, profile: Dict):
         """Store user profile from onboarding"""
-        if user_id not in self.contexts:
-            self.contexts[user_id] = {
-                "profile": {},
-                "sessions": {},
-                "created_at": datetime.utcnow().isoformat()
-            }
-        
-        # Normalize numeric fields
-        normalized_profile = profile.copy()
-        
-        if 'startingCapital' in normalized_profile:
-            normalized_profile['startingCapital'] = self._ensure_numeric(
-                normalized_profile['startingCapital']
-            )
-        
-        if 'profitGoal' in normalized_profile:
-            normalized_profile['profitGoal'] = self._ensure_numeric(
-                normalized_profile['profitGoal']
+        with self._lock:
+            if user_id not in self.contexts:
+                self.contexts[user_id] = UserContext(created_at=time_ns())
+                self._evict_users()
+            else:
+                self.contexts.move_to_end(user_id)
+            
+            # Normalize numeric fields
+            normalized_profile = profile.copy()
+            
+            if 'startingCapital' in normalized_profile:
+                normalized_profile['startingCapital'] = self._ensure_numeric(
+                    normalized_profile['startingCapital']
+                )
+            
+            if 'profitGoal' in normalized_profile:
+                normalized_profile['profitGoal'] = self._ensure_numeric(
+                    normalized_profile['profitGoal']
+                )
+            
+            user_context = self.contexts[user_id]
+            # Resending the same profile every request keeps the rendered section cached
+            if normalized_profile != user_context.profile:
+                user_context.profile = normalized_profile
+                user_context.version += 1
+            logger.debug(
+                "Profile saved for user: %s (capital=$%.2f, goal=$%.2f)",
+                user_id,
+                normalized_profile.get('startingCapital', 0),
+                normalized_profile.get('profitGoal', 0)
             )
-        
-        self.contexts[user_id]["profile"] = normalized_profile
-        print(f"✅ Profile saved for user: {user_id}")
-        print(f"📊 Profile: Capital=${normalized_profile.get('startingCapital', 0):,.2f}, Goal=${normalized_profile.get('profitGoal', 0):,.2f}")
     
-    def get_user_context(self, user_id: str) -> Optional[Dict]:
+    def get_user_context(self, user_id: str) -> Optional[UserContext]:
         """Get user's context"""
-        return self.contexts.get(user_id)
+        with self._lock:
+            user_context = self.contexts.get(user_id)
+            if user_context is not None:
+                self.contexts.move_to_end(user_id)
+            return user_context
+    
+    def _evict_users(self):
+        """Drop least recently used users (and their sessions) beyond MAX_USERS"""
+        while len(self.contexts) > self.MAX_USERS:
+            user_id, user_context = self.contexts.popitem(last=False)
+            for session_id in user_context.sessions:
+                self.sessions.pop((user_id, session_id), None)
+    
+    def get_session(self, user_id: str, session_id: str) -> Optional[Session]:
+        """Get a session with a single lookup"""
+        return self.sessions.get((user_id, session_id))
     
     def create_session(self, user_id: str, session_id: str, agent_type: str):
         """Create a new chat session"""
-        if user_id not in self.contexts:
-            self.set_user_context(user_id, {})
-        
-        self.contexts[user_id]["sessions"][session_id] = {
-            "agent_type": agent_type,
-            "messages": [],
-            "extracted_data": {},
-            "last_search_results": None,  # Store search results here
-            "created_at": datetime.utcnow().isoformat()
-        }
-        print(f"✅ Session created: {session_id}")
+        with self._lock:
+            if user_id not in self.contexts:
+                self.set_user_context(user_id, {})
+            
+            session = Session(
+                agent_type=agent_type,
+                roles=deque(maxlen=self.MAX_MESSAGES),
+                contents=deque(maxlen=self.MAX_MESSAGES),
+                timestamps=deque(maxlen=self.MAX_MESSAGES),
+                created_at=time_ns()
+            )
+            self.contexts[user_id].sessions[session_id] = session
+            self.sessions[(user_id, session_id)] = session
+            logger.debug("Session created: %s", session_id)
     
     def store_search_results(self, user_id: str, session_id: str, search_results: List[Dict]):
         """Store search results for file generation"""
-        if user_id in self.contexts and session_id in self.contexts[user_id]["sessions"]:
-            self.contexts[user_id]["sessions"][session_id]["last_search_results"] = search_results
-            print(f"💾 Stored {len(search_results)} search results for session {session_id}")
+        with self._lock:
+            if (session := self.sessions.get((user_id, session_id))) is not None:
+                session.last_search_results = search_results
+                logger.debug("Stored %d search results for session %s", len(search_results), session_id)
     
     def get_search_results(self, user_id: str, session_id: str) -> Optional[List[Dict]]:
         """Retrieve stored search results"""
-        if user_id in self.contexts and session_id in self.contexts[user_id]["sessions"]:
-            return self.contexts[user_id]["sessions"][session_id].get("last_search_results")
-        return None
+        session = self.sessions.get((user_id, session_id))
+        if session is None:
+            return None
+        return session.last_search_results
     
     def add_message(self, user_id: str, session_id: str, role: str, content: str):
         """Add message and extract key data"""
-        if user_id in self.contexts and session_id in self.contexts[user_id]["sessions"]:
-            session = self.contexts[user_id]["sessions"][session_id]
+        with self._lock:
+            if (session := self.sessions.get((user_id, session_id))) is not None:
+                self.contexts.move_to_end(user_id)
+                session.roles.append(role)
+                session.contents.append(content)
+                session.timestamps.append(time_ns())
             
-            session["messages"].append({
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-            
-            if role == "user":
-                self._extract_and_store_data(user_id, session_id, content)
+                if role == "user" and self._extract_and_store_data(session, content):
+                    session.version += 1
     
-    def _extract_and_store_data(self, user_id: str, session_id: str, message: str):
-        """Extract structured data from user messages"""
-        session = self.contexts[user_id]["sessions"][session_id]
-        extracted = session.get("extracted_data", {})
-        
-        import re
+    def _extract_and_store_data(self, session: Session, message: str) -> bool:
+        """Extract structured data from user messages, returning whether anything changed"""
+        extracted = session.extracted_data
+        before = extracted.copy()
         
         # Extract capital
-        capital_match = re.search(r'\$?(\d{1,3}(?:,?\d{3})*(?:\.\d{2})?)\s*(?:k|thousand)?', message, re.IGNORECASE)
+        capital_match = _CAPITAL_RE.search(message)
         if capital_match:
             amount_str = capital_match.group(1).replace(',', '')
             amount = float(amount_str)
             if 'k' in message.lower() or 'thousand' in message.lower():
                 amount *= 1000
             extracted['capital'] = amount
-            print(f"💰 Extracted capital: ${amount:,.2f}")
+            logger.debug("Extracted capital: $%.2f", amount)
         
         # Extract location
-        location_keywords = ['county', 'city', 'in ', 'near', 'around', 'SC', 'TX', 'FL', 'CA', 'GA']
-        for keyword in location_keywords:
-            if keyword in message:
-                words = message.split()
-                for i, word in enumerate(words):
-                    if keyword.lower() in word.lower():
-                        start = max(0, i-2)
-                        end = min(len(words), i+3)
-                        extracted['location'] = ' '.join(words[start:end])
-                        print(f"📍 Extracted location: {extracted['location']}")
-                        break
+        location_match = _LOCATION_RE.search(message)
+        if location_match:
+            extracted['location'] = ' '.join(location_match.group(0).split())
+            logger.debug("Extracted location: %s", extracted['location'])
         
         # Extract timeline
-        timeline_match = re.search(r'(\d+)\s*(month|year|week)', message, re.IGNORECASE)
+        timeline_match = _TIMELINE_RE.search(message)
         if timeline_match:
             extracted['timeline'] = timeline_match.group(0)
-            print(f"⏰ Extracted timeline: {extracted['timeline']}")
+            logger.debug("Extracted timeline: %s", extracted['timeline'])
         
         # Extract profit goal
-        profit_match = re.search(r'profit.*?\$?(\d{1,3}(?:,?\d{3})*)', message, re.IGNORECASE)
+        profit_match = _PROFIT_RE.search(message)
         if profit_match:
             extracted['profit_goal'] = float(profit_match.group(1).replace(',', ''))
-            print(f"🎯 Extracted profit goal: ${extracted['profit_goal']:,.2f}")
+            logger.debug("Extracted profit goal: $%.2f", extracted['profit_goal'])
         
-        session["extracted_data"] = extracted
+        return extracted != before
     
     def get_session_history(self, user_id: str, session_id: str) -> List[Dict]:
         """Get all messages in a session"""
-        if user_id in self.contexts and session_id in self.contexts[user_id]["sessions"]:
-            return self.contexts[user_id]["sessions"][session_id]["messages"]
-        return []
+        with self._lock:
+            session = self.sessions.get((user_id, session_id))
+            if session is None:
+                return []
+            return [
+                {
+                    "role": role,
+                    "content": content,
+                    "timestamp": _fmt_ts(ts)
+                }
+                for role, content, ts in zip(session.roles, session.contents, session.timestamps)
+            ]
     
-    def get_full_context(self, user_id: str, session_id: str) -> str:
-        """Build comprehensive context string"""
-        context_parts = []
+    def get_recent_history(self, user_id: str, session_id: str, n: int = 8) -> List[Dict]:
+        """Get the last n messages without copying the whole history"""
+        with self._lock:
+            session = self.sessions.get((user_id, session_id))
+            if session is None:
+                return []
+            return [
+                {"role": role, "content": content}
+                for role, content in self._recent_turns(session, n)
+            ]
+    
+    @staticmethod
+    def _recent_turns(session: Session, n: int) -> List[Tuple[str, str]]:
+        """Last n (role, content) pairs, oldest first, walking the deques from the end"""
+        recent = list(zip(
+            islice(reversed(session.roles), n),
+            islice(reversed(session.contents), n)
+        ))
+        recent.reverse()
+        return recent
+    
+    def _format_profile(self, profile: Dict) -> str:
+        """Render the user profile section (empty when there is no profile)"""
+        if not profile:
+            return ""
         
-        # User Profile
-        if user_id in self.contexts:
-            profile = self.contexts[user_id].get("profile", {})
-            if profile:
-                context_parts.append("# USER PROFILE")
-                context_parts.append(f"- Property Type: {profile.get('propertyType', 'Not specified')}")
-                context_parts.append(f"- Strategy: {profile.get('strategy', 'Not specified')}")
-                
-                capital = self._ensure_numeric(profile.get('startingCapital', 0))
-                profit = self._ensure_numeric(profile.get('profitGoal', 0))
-                
-                context_parts.append(f"- Starting Capital: ${capital:,.2f}")
-                context_parts.append(f"- Target Geography: {profile.get('targetGeography', 'Not specified')}")
-                context_parts.append(f"- Timeline: {profile.get('investmentTimeline', 'Not specified')}")
-                context_parts.append(f"- Profit Goal: ${profit:,.2f}")
-                context_parts.append("")
+        return _PROFILE_TEMPLATE.format_map({
+            'propertyType': profile.get('propertyType', 'Not specified'),
+            'strategy': profile.get('strategy', 'Not specified'),
+            'capital': self._ensure_numeric(profile.get('startingCapital', 0)),
+            'targetGeography': profile.get('targetGeography', 'Not specified'),
+            'investmentTimeline': profile.get('investmentTimeline', 'Not specified'),
+            'profit': self._ensure_numeric(profile.get('profitGoal', 0)),
+        })
+    
+    def _get_profile_section(self, user_context: Optional[UserContext]) -> str:
+        """Profile section, cached on the user until the profile version changes"""
+        if user_context is None:
+            return ""
         
-        # Extracted Data
-        if user_id in self.contexts and session_id in self.contexts[user_id]["sessions"]:
-            extracted = self.contexts[user_id]["sessions"][session_id].get("extracted_data", {})
-            if extracted:
-                context_parts.append("# EXTRACTED FROM CONVERSATION")
-                for key, value in extracted.items():
-                    if key in ['capital', 'profit_goal']:
-                        num_val = self._ensure_numeric(value)
-                        context_parts.append(f"- {key.replace('_', ' ').title()}: ${num_val:,.2f}")
-                    else:
-                        context_parts.append(f"- {key.replace('_', ' ').title()}: {value}")
-                context_parts.append("")
+        cached = user_context.profile_cache
+        if cached is not None and cached[0] == user_context.version:
+            return cached[1]
         
-        # Recent History
-        history = self.get_session_history(user_id, session_id)
-        if history:
-            context_parts.append("# RECENT CONVERSATION")
-            for msg in history[-6:]:
-                role = msg['role'].upper()
-                content = msg['content'][:200]
-                context_parts.append(f"[{role}]: {content}")
-            context_parts.append("")
+        section = self._format_profile(user_context.profile)
+        user_context.profile_cache = (user_context.version, section)
+        return section
+    
+    def _build_context_prefix(self, profile_section: str, extracted: Dict) -> str:
+        """Join the rendered profile section with the extracted-data section"""
+        context_parts = [profile_section] if profile_section else []
         
-        context_parts.append("# INSTRUCTIONS")
-        context_parts.append("- USE PROVIDED DATA ONLY")
-        context_parts.append("- DO NOT INVENT ADDRESSES OR PRICES")
-        context_parts.append("- CITE SOURCES FOR SEARCH RESULTS")
-        context_parts.append("- REMEMBER ALL CONVERSATION CONTEXT")
+        # Extracted Data
+        if extracted:
+            context_parts.append("# EXTRACTED FROM CONVERSATION")
+            for key, value in extracted.items():
+                if key in ['capital', 'profit_goal']:
+                    num_val = self._ensure_numeric(value)
+                    context_parts.append(f"- {key.replace('_', ' ').title()}: ${num_val:,.2f}")
+                else:
+                    context_parts.append(f"- {key.replace('_', ' ').title()}: {value}")
+            context_parts.append("")
         
-        return "\n".join(context_parts)
\ No newline at end of file
+        return "\n".join(context_parts)
+    
+    def get_full_context(self, user_id: str, session_id: str) -> str:
+        """Build comprehensive context string"""
+        with self._lock:
+            user_context = self.contexts.get(user_id)
+            session = self.sessions.get((user_id, session_id))
+            profile_section = self._get_profile_section(user_context)
+            
+            # Profile + extracted sections only change when either version moves
+            if session is not None:
+                version = (user_context.version, session.version)
+                cached = session.context_cache
+                if cached is not None and cached[0] == version:
+                    prefix = cached[1]
+                else:
+                    prefix = self._build_context_prefix(profile_section, session.extracted_data)
+                    session.context_cache = (version, prefix)
+            else:
+                prefix = profile_section
+            
+            context_parts = []
+            
+            # Recent History
+            history = self._recent_turns(session, 6) if session is not None else []
+            if history:
+                context_parts.append("# RECENT CONVERSATION")
+                for role, content in history:
+                    context_parts.append(f"[{role.upper()}]: {content[:200]}")
+                context_parts.append("")
+            
+            context_parts.append(_CONTEXT_INSTRUCTIONS)
+            
+            suffix = "\n".join(context_parts)
+            return f"{prefix}\n{suffix}" if prefix else suffix
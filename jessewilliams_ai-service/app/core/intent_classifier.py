@@ -1,7 +1,16 @@
 """Enhanced Intent Classification with Greeting Detection"""
 
 import re
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Tuple
+from app.core._regex import MultiPattern
+
+# Optional multi-pattern keyword scanner
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 class IntentClassifier:
     """Classifies user queries with proper greeting handling"""
@@ -74,53 +83,85 @@ class IntentClassifier:
         }
     }
     
+    # Classification results kept for repeated messages (menu picks, canned prompts)
+    CACHE_SIZE = 2048
+    
+    def __init__(self):
+        self._classify_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._classify)
+        self._pattern_matchers = {
+            intent: MultiPattern(config['patterns'])
+            for intent, config in self.INTENTS.items()
+        }
+        self._keyword_automaton = self._build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+        self._greetings_set = frozenset(self.GREETINGS)
+        # Longest phrases first so "good morning" wins over shorter overlaps
+        self._greeting_re = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, sorted(self.GREETINGS, key=len, reverse=True))) + r')\b'
+        )
+    
+    def _build_keyword_automaton(self):
+        """One Aho-Corasick automaton over every intent's keywords"""
+        automaton = ahocorasick.Automaton()
+        for config in self.INTENTS.values():
+            for keyword in config['keywords']:
+                automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
     def is_greeting(self, message: str) -> bool:
         """Check if message is just a greeting"""
-        message_clean = message.lower().strip().rstrip('!.?')
-        
+        return self._is_greeting_fast(message.lower().strip().rstrip('!.?'))
+    
+    def _is_greeting_fast(self, message_clean: str) -> bool:
+        """Greeting check on a message that is already lower-cased and stripped"""
         # Exact match greetings
-        if message_clean in self.GREETINGS:
+        if message_clean in self._greetings_set:
             return True
         
         # Check if message is ONLY greetings (no other words)
         words = message_clean.split()
         if len(words) <= 3:  # Short messages
-            for greeting in self.GREETINGS:
-                if greeting in message_clean:
-                    return True
+            return self._greeting_re.search(message_clean) is not None
         
         return False
     
     def classify(self, message: str) -> Tuple[str, float, Dict]:
         """
-        Classify user message into intent
+        Classify user message into intent (LRU-cached on the normalized message)
         
         Returns:
             (intent_name, confidence_score, metadata)
         """
+        return self._classify_cached(message.lower().strip())
+    
+    def _classify(self, message_lower: str) -> Tuple[str, float, Dict]:
+        """Score an already lower-cased, stripped message against every intent"""
         
         # Check for greeting first
-        if self.is_greeting(message):
+        if self._is_greeting_fast(message_lower.rstrip('!.?')):
             return 'greeting', 1.0, {'reason': 'greeting_detected'}
         
-        message_lower = message.lower()
         scores = {}
         
+        # All keyword hits in a single pass when the automaton is available,
+        # otherwise fall back to substring checks against the message
+        if self._keyword_automaton is not None:
+            keyword_haystack = {keyword for _, keyword in self._keyword_automaton.iter(message_lower)}
+        else:
+            keyword_haystack = message_lower
+        
         # Score each intent
         for intent, config in self.INTENTS.items():
-            score = 0
-            matched_keywords = []
             matched_patterns = []
             
             # Check keywords
-            for keyword in config['keywords']:
-                if keyword in message_lower:
-                    score += 1
-                    matched_keywords.append(keyword)
+            matched_keywords = [kw for kw in config['keywords'] if kw in keyword_haystack]
+            score = len(matched_keywords)
             
             # Check patterns (higher weight)
-            for pattern in config['patterns']:
-                if re.search(pattern, message_lower, re.IGNORECASE):
+            pattern_hits = self._pattern_matchers[intent].matches(message_lower)
+            for i, pattern in enumerate(config['patterns']):
+                if i in pattern_hits:
                     score += 3
                     matched_patterns.append(pattern)
             
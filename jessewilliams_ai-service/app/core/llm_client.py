@@ -1,12 +1,28 @@
 """LLM Client with Web Search Integration"""
 
+import asyncio
+import logging
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 import aiohttp
-from bs4 import BeautifulSoup
-import json
+from app.utils.async_cache import async_ttl_cache
+from app.utils.json_utils import json_loads
+
+logger = logging.getLogger(__name__)
+
+class Listing(NamedTuple):
+    """Normalized property listing (use ._asdict() when a dict is needed)"""
+    source: str
+    source_url: str
+    address: str
+    city: str
+    state: str
+    zip: str
+    price: Any
+    lot_size: Any
+    description: str
 
 class LLMClient:
     """Production LLM client with web search capabilities"""
@@ -30,8 +46,27 @@ class LLMClient:
             'serp_api': os.getenv("SERP_API_KEY")  # For general search
         }
         
-        print("✅ LLM Client with Web Search Ready")
+        # Shared HTTP session (keep-alive + pooled connections), created on first use
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        logger.info("LLM Client with Web Search Ready")
+    
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it inside the running event loop"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+            )
+        return self._http
     
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+    
+    @async_ttl_cache(maxsize=512, ttl=600)
     async def search_property_listings(
         self,
         location: str,
@@ -43,7 +78,7 @@ class LLMClient:
         Simulates Zillow, LandWatch, Realtor.com searches
         """
         
-        print(f"🔍 Searching {property_type} in {location} under ${max_price or 'any price'}...")
+        logger.debug("Searching %s in %s under $%s", property_type, location, max_price or 'any price')
         
         # In production, use real APIs. For now, simulate structure
         # that would come from Zillow/LandWatch/Realtor APIs
@@ -56,7 +91,8 @@ class LLMClient:
             location, max_price, property_type
         )
         
-        return sources
+        # Listings stay compact NamedTuples internally; callers get plain dicts
+        return [s._asdict() if isinstance(s, Listing) else s for s in sources]
     
     async def _fetch_from_multiple_sources(
         self,
@@ -69,20 +105,21 @@ class LLMClient:
         sources = []
         
         # Source 1: Zillow (via RapidAPI or direct if available)
-        zillow_results = await self._search_zillow(location, max_price, property_type)
-        if zillow_results:
-            sources.extend(zillow_results)
+        tasks = [self._search_zillow(location, max_price, property_type)]
         
         # Source 2: LandWatch (for land specifically)
         if property_type == "land":
-            landwatch_results = await self._search_landwatch(location, max_price)
-            if landwatch_results:
-                sources.extend(landwatch_results)
+            tasks.append(self._search_landwatch(location, max_price))
         
         # Source 3: Realtor.com
-        realtor_results = await self._search_realtor(location, max_price, property_type)
-        if realtor_results:
-            sources.extend(realtor_results)
+        tasks.append(self._search_realtor(location, max_price, property_type))
+        
+        # Query all sources concurrently; a failing provider doesn't sink the others
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, list):
+                sources.extend(result)
+            elif isinstance(result, Exception):
+                logger.warning("Listing source error: %s", result)
         
         return sources
     
@@ -91,7 +128,7 @@ class LLMClient:
         location: str,
         max_price: int,
         property_type: str
-    ) -> List[Dict]:
+    ) -> List[Listing]:
         """Search Zillow via RapidAPI or web scraping"""
         
         # If RapidAPI key available, use it
@@ -102,7 +139,7 @@ class LLMClient:
         # In production, implement actual scraping or API call
         return []
     
-    async def _zillow_api_search(self, location: str, max_price: int) -> List[Dict]:
+    async def _zillow_api_search(self, location: str, max_price: int) -> List[Listing]:
         """Use RapidAPI Zillow endpoint"""
         
         url = "https://zillow-com1.p.rapidapi.com/propertyExtendedSearch"
@@ -120,35 +157,32 @@ class LLMClient:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=querystring) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._format_zillow_results(data)
+            async with self._get_http().get(url, headers=headers, params=querystring) as response:
+                if response.status == 200:
+                    data = json_loads(await response.read())
+                    return self._format_zillow_results(data)
         except Exception as e:
-            print(f"⚠️ Zillow API error: {e}")
+            logger.warning("Zillow API error: %s", e)
         
         return []
     
-    def _format_zillow_results(self, raw_data: Dict) -> List[Dict]:
+    def _format_zillow_results(self, raw_data: Dict) -> List[Listing]:
         """Format Zillow API response to standard structure"""
         
-        formatted = []
-        
-        for prop in raw_data.get('props', []):
-            formatted.append({
-                'source': 'Zillow',
-                'source_url': f"https://www.zillow.com/homedetails/{prop.get('zpid', '')}",
-                'address': prop.get('address', 'N/A'),
-                'city': prop.get('city', 'N/A'),
-                'state': prop.get('state', 'N/A'),
-                'zip': prop.get('zipcode', 'N/A'),
-                'price': prop.get('price', 0),
-                'lot_size': prop.get('lotSize', 'N/A'),
-                'description': prop.get('description', '')[:200]
-            })
-        
-        return formatted
+        return [
+            Listing(
+                'Zillow',
+                f"https://www.zillow.com/homedetails/{prop.get('zpid', '')}",
+                prop.get('address', 'N/A'),
+                prop.get('city', 'N/A'),
+                prop.get('state', 'N/A'),
+                prop.get('zipcode', 'N/A'),
+                prop.get('price', 0),
+                prop.get('lotSize', 'N/A'),
+                prop.get('description', '')[:200]
+            )
+            for prop in raw_data.get('props', ())
+        ]
     
     async def _search_landwatch(self, location: str, max_price: int) -> List[Dict]:
         """Search LandWatch for land listings"""
@@ -173,12 +207,14 @@ class LLMClient:
         
         # Use SERP API to search for market trends
         if self.search_apis.get('serp_api'):
-            query = f"{location} real estate market trends 2024"
+            # Normalized so equivalent locations share a cache entry
+            query = f"{' '.join(location.lower().split())} real estate market trends 2024"
             results = await self._serp_search(query)
             return results
         
         return {}
     
+    @async_ttl_cache(maxsize=512, ttl=600)
     async def _serp_search(self, query: str) -> Dict:
         """Use SerpAPI for general web search"""
         
@@ -191,9 +227,8 @@ class LLMClient:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
+            async with self._get_http().get(url, params=params) as response:
+                if response.status == 200:
+                    return json_loads(await response.read())
         except Exception as e:
-            print(f"⚠️ SERP API error: {e}")
\ No newline at end of file
+            logger.warning("SERP API error: %s", e)
\ No newline at end of file
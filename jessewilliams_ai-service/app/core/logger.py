@@ -0,0 +1,63 @@
+"""Logging setup for the AI service"""
+
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Third-party loggers that log every HTTP request (OpenAI + CSE calls) at INFO
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+# Background thread that does the actual handler I/O, and the root handler feeding it
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def setup_logger(level: str = None) -> logging.Logger:
+    """
+    Configure the root logger once at startup (LOG_LEVEL env, default INFO)
+    
+    Request-path logging only enqueues records; a QueueListener thread writes them
+    to stdout and, when LOG_FILE is set, to that file.
+    """
+    global _listener, _queue_handler
+    
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    if not root.handlers:
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler(sys.stdout)]
+        
+        log_file = os.getenv("LOG_FILE")
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, delay=True))
+        
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        _queue_handler = QueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    
+    return root
+
+def shutdown_logger():
+    """Flush queued records, stop the listener thread and detach it from the root logger"""
+    global _listener, _queue_handler
+    
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
@@ -0,0 +1,15 @@
+"""Shared OpenAI client with explicit connection pooling"""
+
+import os
+import httpx
+from openai import AsyncOpenAI
+
+# One pooled async client for every agent so concurrent requests reuse keep-alive
+# connections without blocking the event loop
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=60.0
+    )
+)
@@ -1,15 +1,20 @@
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import hmac
 import os
-from jose import jwt, JWTError
+import jwt
+from jwt import InvalidTokenError as JWTError
 
 security = HTTPBearer()
 
+# Read once at import (main loads .env before importing this module)
+_INTERNAL_SECRET = os.getenv("INTERNAL_API_SECRET", "").encode()
+_JWT_SECRET = os.getenv("JWT_SECRET")
+
 def verify_internal_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
     """Verify internal API key from Node.js backend"""
-    internal_secret = os.getenv("INTERNAL_API_SECRET")
-    
-    if credentials.credentials != internal_secret:
+    # Constant-time comparison; an unset secret never matches
+    if not _INTERNAL_SECRET or not hmac.compare_digest(credentials.credentials.encode(), _INTERNAL_SECRET):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key"
@@ -21,7 +26,7 @@ def verify_jwt_token(token: str) -> dict:
     try:
         payload = jwt.decode(
             token,
-            os.getenv("JWT_SECRET"),
+            _JWT_SECRET,
             algorithms=["HS256"]
         )
         return payload
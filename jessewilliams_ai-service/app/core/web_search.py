@@ -4,12 +4,185 @@ Uses ONLY Google CSE with entire web enabled
 """
 
 import os
-import aiohttp
-import json
+import httpx
+import logging
+import random
 import re
-from typing import List, Dict, Optional
-from datetime import datetime
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional, Tuple
+from datetime import datetime, timezone
 import asyncio
+from app.utils.async_cache import async_ttl_cache
+from app.utils.rate_limiter import RateLimiter
+from app.utils.json_utils import json_loads
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 lets the concurrent CSE queries share one multiplexed connection
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# On-disk cache of raw CSE responses, shared by workers and kept across restarts
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Linear-time (DFA) engine for the extractors when google-re2 is installed
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Extraction patterns, tried in order. Written lower-case: they run case-sensitively
+# over lower-cased ASCII text, and with IGNORECASE over anything else
+_ADDRESS_SOURCES = (
+    # Pattern 1: Standard street address
+    r'\d{1,5}\s+[a-z][a-z]+(?:\s+[a-z][a-z]+)*\s+(?:st|street|ave|avenue|rd|road|dr|drive|ln|lane|ct|court|blvd|boulevard|way|pkwy|pl|place|loop|cir|circle)',
+    
+    # Pattern 2: Address with city
+    r'\d{1,5}\s+[a-z\s]+,\s+[a-z]{2}',
+    
+    # Pattern 3: Just numbered lot with location
+    r'(?:lot|property|address)[\s:]+[\w\s,]+(?:tx|texas|fl|florida|ca|california)',
+)
+
+_PRICE_SOURCES = (
+    r'\$\s*(\d{1,3}(?:,\d{3})+(?:\.\d{2})?)',  # $200,000 or $200,000.00
+    r'\$(\d{3,})',  # $200000
+    r'(\d+),(\d{3})\s*(?:dollars|usd)',  # 200,000 dollars
+)
+
+_ACRES_SOURCES = (
+    r'([\d.]+)\s*acres?(?:\s|$)',
+    r'(?:lot size|property size)[\s:]*([0-9.]+)\s*acres?',
+    r'([\d.]+)\s*(?:ac|acre)(?:\s|$)',
+)
+
+def _compile_extractors(compile_pattern: Callable) -> tuple:
+    """(address, price, acres) pattern lists built with the given compile function"""
+    return tuple(
+        [compile_pattern(pattern) for pattern in sources]
+        for sources in (_ADDRESS_SOURCES, _PRICE_SOURCES, _ACRES_SOURCES)
+    )
+
+# The lower-cased ASCII path can use RE2: its \d and \w match Python's on ASCII, but its
+# \s leaves out \v and \x1c-\x1f, so text containing those stays on the stdlib path
+# along with non-ASCII text (Unicode classes and case folding)
+_LOWERCASE_EXTRACTORS = _compile_extractors(re2.compile if RE2_AVAILABLE else re.compile)
+_ANYCASE_EXTRACTORS = _compile_extractors(lambda pattern: re.compile(pattern, re.IGNORECASE))
+
+# ASCII characters Python's \s matches but RE2's doesn't
+_PY_ONLY_SPACE_RE = re.compile(r'[\v\x1c-\x1f]')
+
+# Property indicators (substring semantics, same as the old `keyword in text` checks)
+_PROPERTY_KW_RE = re.compile(
+    r'property|land|home|house|listing|for sale|acre|lot|real estate|residential|commercial|address'
+)
+
+# Every price/acreage pattern and the first two address patterns need a digit to yield a value
+_DIGIT_RE = re.compile(r'\d')
+
+# Fail fast per request; search_properties also caps the whole search
+_CSE_TIMEOUT = httpx.Timeout(10.0, connect=3.0, read=8.0)
+
+# Transient failures worth retrying: rate limiting and server-side errors
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_ATTEMPTS = 3
+_RETRY_MAX_DELAY = 5.0
+
+# Seconds a raw CSE response stays in the disk cache
+_DISK_CACHE_TTL = 900
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After if given, else backoff + jitter"""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), _RETRY_MAX_DELAY)
+    return 0.2 * 2 ** attempt + random.uniform(0, 0.1)
+
+# Domain substring -> source name, checked in order
+_SOURCES = {
+    'zillow': 'Zillow',
+    'realtor.com': 'Realtor.com',
+    'redfin': 'Redfin',
+    'landwatch': 'LandWatch',
+    'loopnet': 'LoopNet',
+    'facebook': 'Facebook',
+    'craigslist': 'Craigslist',
+    'trulia': 'Trulia',
+    'mls': 'MLS',
+    'county': 'County Records'
+}
+
+@dataclass(slots=True)
+class PropertyResult:
+    """One extracted listing (converted to a dict at the search_properties boundary)"""
+    title: str
+    address: str
+    price: int
+    acres: Optional[float]
+    property_type: str
+    source: str
+    source_url: str
+    description: str
+    confidence: str
+    found_at: str
+    
+    def to_dict(self) -> Dict:
+        """Plain dict in the shape callers store and serialize"""
+        return {
+            'title': self.title,
+            'address': self.address,
+            'price': self.price,
+            'acres': self.acres,
+            'property_type': self.property_type,
+            'source': self.source,
+            'source_url': self.source_url,
+            'description': self.description,
+            'confidence': self.confidence,
+            'found_at': self.found_at
+        }
+
+@lru_cache(maxsize=1024)
+def _source_for_domain(domain: str) -> str:
+    """Source name for a domain (cached - the same few domains recur across results)"""
+    domain_lower = domain.lower()
+    
+    for key, name in _SOURCES.items():
+        if key in domain_lower:
+            return name
+    
+    # Return domain name
+    return domain.split('.')[0].title()
+
+@lru_cache(maxsize=1024)
+def _search_queries(location: str, property_type: str, max_price: Optional[int]) -> Tuple[str, ...]:
+    """CSE query variations for a search (cached - users repeat the same searches)"""
+    
+    price_suffix = f" under ${max_price:,}" if max_price else ""
+    
+    return (
+        # Query 1: Direct listing search with year
+        f'"{location}" {property_type} for sale 2024 2025',
+        
+        # Query 2: MLS platforms
+        f'{location} {property_type} listing mls OR zillow OR realtor OR redfin',
+        
+        # Query 3: Available now
+        f'{location} {property_type} available now{price_suffix}',
+        
+        # Query 4: County + property type
+        f'{location} county {property_type} property{price_suffix}',
+        
+        # Query 5: Shorthand property keywords
+        f'{location} "{property_type} for sale"',
+    )
 
 class GoogleCSEPropertySearch:
     """
@@ -17,6 +190,16 @@ class GoogleCSEPropertySearch:
     Designed for entire web search mode
     """
     
+    # In-flight CSE requests per instance
+    MAX_CONCURRENT_QUERIES = 3
+    
+    # Outbound CSE request rate (token bucket: per second, burst)
+    RATE_LIMIT = 5.0
+    RATE_BURST = 10
+    
+    # Wall-clock budget for one search_properties call (seconds)
+    SEARCH_BUDGET = 20
+    
     def __init__(self):
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.google_cse_id = os.getenv("GOOGLE_CSE_ID")
@@ -24,7 +207,53 @@ class GoogleCSEPropertySearch:
         if not self.google_api_key or not self.google_cse_id:
             raise ValueError("❌ GOOGLE_API_KEY and GOOGLE_CSE_ID required in .env")
         
-        print("✅ Google CSE Property Search Initialized")
+        self._query_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_QUERIES)
+        self._rate_limiter = RateLimiter(rate=self.RATE_LIMIT, max_tokens=self.RATE_BURST)
+        
+        # Static CSE query string, encoded once; only q (and a smaller num) vary per call.
+        # The API key goes in a header so it never shows up in logged request URLs
+        self._cse_url = httpx.URL("https://www.googleapis.com/customsearch/v1", params={
+            "cx": self.google_cse_id,
+            "num": 10,  # Max 10 per API call
+            "gl": "us",
+            "lr": "lang_en",
+        })
+        
+        # Shared HTTP client (HTTP/2 when h2 is installed, pooled keep-alive), created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        self._disk_cache = None
+        if DISKCACHE_AVAILABLE:
+            self._disk_cache = diskcache.Cache(
+                os.getenv("CSE_CACHE_DIR", "/tmp/cse_cache"),
+                size_limit=1 << 30
+            )
+        
+        logger.info("Google CSE Property Search Initialized")
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, recreating it after close()"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                headers={"X-Goog-Api-Key": self.google_api_key},
+                timeout=_CSE_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=10,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=30
+                )
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        
+        if self._disk_cache is not None:
+            self._disk_cache.close()
     
     async def search_properties(
         self,
@@ -38,137 +267,170 @@ class GoogleCSEPropertySearch:
         Returns list of properties with: address, price, acres, source_url
         """
         
-        print(f"\n🔍 GOOGLE CSE PROPERTY SEARCH")
-        print(f"   Location: {location}")
-        print(f"   Type: {property_type}")
-        if max_price:
-            print(f"   Max Price: ${max_price:,}")
+        logger.debug(
+            "Google CSE property search: location=%s type=%s max_price=%s",
+            location, property_type, max_price
+        )
         
-        results = []
+        # Deduplicated as pages arrive, so the early stop counts unique properties
+        unique_results = []
+        seen = set()
         
         # Build multiple queries to cast wide net
         queries = self._build_search_queries(location, property_type, max_price)
         
-        for query_idx, query in enumerate(queries[:5], 1):  # Try up to 5 queries
-            print(f"\n📋 Query {query_idx}: '{query}'")
-            
-            try:
-                page_results = await self._execute_cse_query(query, max_results=20)
-                results.extend(page_results)
-                print(f"   ✅ Found {len(page_results)} results")
+        # Run up to 5 queries concurrently, bounded by the semaphore
+        tasks = [
+            asyncio.create_task(self._execute_cse_query_limited(query_idx, query))
+            for query_idx, query in enumerate(queries[:5], 1)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=self.SEARCH_BUDGET):
+                try:
+                    page_results = await next_done
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    logger.warning("Query failed: %.100s", e)
+                    continue
+                
+                unique_results.extend(self._deduplicate_results(page_results, seen))
+                logger.debug("Found %d results", len(page_results))
                 
                 # Stop if we have enough
-                if len(results) >= 15:
-                    print(f"   (Stopping - sufficient results gathered)")
+                if len(unique_results) >= 15:
+                    logger.debug("Stopping - sufficient results gathered")
                     break
-                
-                await asyncio.sleep(0.5)  # Rate limit
-            
-            except Exception as e:
-                print(f"   ❌ Query failed: {str(e)[:100]}")
-                continue
-        
-        # Remove duplicates and clean
-        unique_results = self._deduplicate_results(results)
+        except asyncio.TimeoutError:
+            # Out of budget - return what has arrived so far
+            logger.warning("Search budget of %ss exhausted, returning partial results", self.SEARCH_BUDGET)
+        finally:
+            # Cancel queries still queued or in flight once we stop early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
-        print(f"\n✅ SEARCH COMPLETE")
-        print(f"   Total Found: {len(unique_results)} unique properties")
+        logger.info("Search complete: %d unique properties", len(unique_results))
         
-        return unique_results[:25]  # Return top 25
+        return [result.to_dict() for result in unique_results[:25]]  # Return top 25
     
     def _build_search_queries(
         self,
         location: str,
         property_type: str,
         max_price: Optional[int]
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Build diverse queries to find properties"""
         
-        price_suffix = f" under ${max_price:,}" if max_price else ""
-        
-        queries = [
-            # Query 1: Direct listing search with year
-            f'"{location}" {property_type} for sale 2024 2025',
-            
-            # Query 2: MLS platforms
-            f'{location} {property_type} listing mls OR zillow OR realtor OR redfin',
-            
-            # Query 3: Available now
-            f'{location} {property_type} available now{price_suffix}',
-            
-            # Query 4: County + property type
-            f'{location} county {property_type} property{price_suffix}',
-            
-            # Query 5: Shorthand property keywords
-            f'{location} "{property_type} for sale"',
-        ]
-        
-        return queries
+        return _search_queries(location, property_type, max_price)
+    
+    async def _execute_cse_query_limited(self, query_idx: int, query: str) -> List[PropertyResult]:
+        """Execute a CSE query once a concurrency slot is free"""
+        async with self._query_semaphore:
+            logger.debug("Query %d: '%s'", query_idx, query)
+            return await self._execute_cse_query(query, max_results=20)
     
+    @async_ttl_cache(maxsize=512, ttl=600)
     async def _execute_cse_query(
         self,
         query: str,
         max_results: int = 20
-    ) -> List[Dict]:
+    ) -> List[PropertyResult]:
         """Execute single Google CSE query"""
         
-        url = "https://www.googleapis.com/customsearch/v1"
-        
-        params = {
-            "key": self.google_api_key,
-            "cx": self.google_cse_id,
-            "q": query,
-            "num": min(10, max_results),  # Max 10 per API call
-            "gl": "us",
-            "lr": "lang_en",
-        }
+        url = self._cse_url.copy_add_param("q", query)
+        if max_results < 10:
+            url = url.copy_set_param("num", max_results)
         
         results = []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"HTTP {response.status}: {error_text[:200]}")
-                    
-                    data = await response.json()
-                    
-                    if 'error' in data:
-                        error_msg = data['error'].get('message', 'Unknown error')
-                        raise Exception(f"CSE API Error: {error_msg}")
-                    
-                    if 'items' not in data:
-                        print(f"   ⚠️  No results in response")
-                        return results
-                    
-                    # Parse each result
-                    for item in data.get('items', []):
-                        title = item.get('title', '')
-                        snippet = item.get('snippet', '')
-                        link = item.get('link', '')
-                        domain = item.get('displayLink', '')
-                        
-                        # Try to extract property data
-                        prop_data = self._extract_property_data(
-                            title=title,
-                            snippet=snippet,
-                            link=link,
-                            domain=domain
-                        )
-                        
-                        if prop_data:
-                            results.append(prop_data)
+            data = json_loads(await self._fetch_cse(url))
+            
+            if 'error' in data:
+                error_msg = data['error'].get('message', 'Unknown error')
+                raise Exception(f"CSE API Error: {error_msg}")
+            
+            if 'items' not in data:
+                logger.debug("No results in response")
+                return results
+            
+            # Parsed inline: a 10-item page costs well under the
+            # overhead of handing it to a worker thread
+            results = self._parse_items(data['items'])
         
-        except asyncio.TimeoutError:
-            print(f"   ❌ Request timeout")
+        except httpx.TimeoutException:
+            logger.warning("CSE request timeout")
         except Exception as e:
-            print(f"   ❌ API Error: {str(e)[:150]}")
+            logger.warning("CSE API error: %.150s", e)
+        
+        return results
+    
+    async def _fetch_cse(self, url: httpx.URL) -> bytes:
+        """Raw CSE response body, from the disk cache while fresh"""
+        
+        if self._disk_cache is None:
+            return await self._get_with_retry(url)
+        
+        cache_key = str(url)
+        
+        body = await asyncio.to_thread(self._disk_cache.get, cache_key)
+        if body is None:
+            body = await self._get_with_retry(url)
+            await asyncio.to_thread(self._disk_cache.set, cache_key, body, expire=_DISK_CACHE_TTL)
+        
+        return body
+    
+    async def _get_with_retry(self, url: httpx.URL, retries: int = _RETRY_ATTEMPTS) -> bytes:
+        """GET a CSE URL and return the body, retrying timeouts, connection errors and 429/5xx"""
+        
+        client = self._get_client()
+        
+        for attempt in range(retries):
+            last_attempt = attempt == retries - 1
+            retry_after = None
+            
+            try:
+                await self._rate_limiter.acquire()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    return response.content
+                
+                if last_attempt or response.status_code not in _RETRY_STATUSES:
+                    raise Exception(f"HTTP {response.status_code}: {response.content[:200].decode(errors='replace')}")
+                
+                retry_after = response.headers.get('Retry-After')
+                reason = f"HTTP {response.status_code}"
+            
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                reason = type(e).__name__
+            
+            delay = _retry_delay(attempt, retry_after)
+            logger.debug("CSE attempt %d failed (%s), retrying in %.2fs", attempt + 1, reason, delay)
+            await asyncio.sleep(delay)
+    
+    def _parse_items(self, items: List[Dict]) -> List[PropertyResult]:
+        """Extract listings from one page of CSE items"""
+        
+        # One timestamp for the whole page
+        found_at = datetime.now(timezone.utc).isoformat()
+        results = []
+        
+        for item in items:
+            # Try to extract property data
+            prop_data = self._extract_property_data(
+                title=item.get('title', ''),
+                snippet=item.get('snippet', ''),
+                link=item.get('link', ''),
+                domain=item.get('displayLink', ''),
+                found_at=found_at
+            )
+            
+            if prop_data:
+                results.append(prop_data)
         
         return results
     
@@ -177,49 +439,47 @@ class GoogleCSEPropertySearch:
         title: str,
         snippet: str,
         link: str,
-        domain: str
-    ) -> Optional[Dict]:
+        domain: str,
+        found_at: Optional[str] = None
+    ) -> Optional[PropertyResult]:
         """
         Extract property information from search result
         LENIENT: Accept partial matches, not just perfect addresses
         """
         
-        combined_text = f"{title} {snippet}".lower()
         full_text = title + " " + snippet
+        combined_text = full_text.lower()
         
         # FILTER 1: Must contain property indicators
-        property_keywords = [
-            'property', 'land', 'home', 'house', 'listing',
-            'for sale', 'acre', 'lot', 'real estate',
-            'residential', 'commercial', 'address'
-        ]
-        
-        has_property_keyword = any(
-            keyword in combined_text for keyword in property_keywords
-        )
-        
-        if not has_property_keyword:
+        if not _PROPERTY_KW_RE.search(combined_text):
             return None
         
-        # FILTER 2: Reject obvious non-property pages
-        reject_keywords = [
-            'blog', 'article', 'news', 'guide', 'how to',
-            'calculator', 'map', 'search', 'directory',
-            'email', 'phone', 'contact'
-        ]
-        
-        if any(keyword in combined_text for keyword in reject_keywords):
-            # Some of these can still have listings, but lower confidence
-            pass
-        
-        # EXTRACTION 1: Try to find address (multiple patterns)
-        address = self._extract_address(full_text)
+        # Pages mentioning blog/news/guide/etc. are deliberately not rejected -
+        # some of them still carry listings
         
-        # EXTRACTION 2: Try to find price
-        price = self._extract_price(full_text)
+        # Lower-casing ASCII keeps offsets, so the already lower-cased text can be scanned
+        # without IGNORECASE and addresses sliced back out of the original
+        if full_text.isascii() and not (RE2_AVAILABLE and _PY_ONLY_SPACE_RE.search(full_text)):
+            scan_text = combined_text
+            address_patterns, price_patterns, acres_patterns = _LOWERCASE_EXTRACTORS
+        else:
+            scan_text = full_text
+            address_patterns, price_patterns, acres_patterns = _ANYCASE_EXTRACTORS
         
-        # EXTRACTION 3: Try to find lot size
-        acres = self._extract_acres(full_text)
+        if _DIGIT_RE.search(scan_text):
+            # EXTRACTION 1: Try to find address (multiple patterns)
+            address = self._extract_address(scan_text, full_text, address_patterns)
+            
+            # EXTRACTION 2: Try to find price
+            price = self._extract_price(scan_text, price_patterns)
+            
+            # EXTRACTION 3: Try to find lot size
+            acres = self._extract_acres(scan_text, acres_patterns)
+        else:
+            # No digits: only the "Lot/Property/Address ... <state>" pattern can match
+            address = self._extract_address(scan_text, full_text, address_patterns[2:])
+            price = 0
+            acres = None
         
         # DECISION: Need at least address OR (price AND acres)
         # Don't require perfect address match
@@ -227,55 +487,36 @@ class GoogleCSEPropertySearch:
             return None  # Too little info
         
         # Build result
-        result = {
-            'title': title[:100],
-            'address': address or f"{domain} listing",  # Fallback
-            'price': price,
-            'acres': acres,
-            'property_type': self._determine_property_type(combined_text),
-            'source': self._identify_source(domain),
-            'source_url': link,
-            'description': snippet[:200],
-            'confidence': self._calculate_confidence(address, price, acres),
-            'found_at': datetime.utcnow().isoformat()
-        }
-        
-        return result
+        return PropertyResult(
+            title=title[:100],
+            address=address or f"{domain} listing",  # Fallback
+            price=price,
+            acres=acres,
+            property_type=self._determine_property_type(combined_text),
+            source=self._identify_source(domain),
+            source_url=link,
+            description=snippet[:200],
+            confidence=self._calculate_confidence(address, price, acres),
+            found_at=found_at or datetime.now(timezone.utc).isoformat()
+        )
     
-    def _extract_address(self, text: str) -> Optional[str]:
-        """Extract property address from text"""
-        
-        patterns = [
-            # Pattern 1: Standard street address
-            r'\d{1,5}\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Ct|Court|Blvd|Boulevard|Way|Pkwy|Pl|Place|Loop|Cir|Circle)',
-            
-            # Pattern 2: Address with city
-            r'\d{1,5}\s+[A-Za-z\s]+,\s+[A-Z]{2}',
-            
-            # Pattern 3: Just numbered lot with location
-            r'(?:Lot|Property|Address)[\s:]+[\w\s,]+(?:TX|Texas|FL|Florida|CA|California)',
-        ]
+    def _extract_address(self, text: str, display_text: str, patterns: List["re.Pattern"]) -> Optional[str]:
+        """Extract property address from text, returned with display_text's casing"""
         
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
-                address = match.group(0).strip()
+                address = display_text[match.start():match.end()].strip()
                 if len(address) > 10:  # Reasonable length
                     return address
         
         return None
     
-    def _extract_price(self, text: str) -> int:
+    def _extract_price(self, text: str, patterns: List["re.Pattern"]) -> int:
         """Extract price from text"""
         
-        patterns = [
-            r'\$\s*(\d{1,3}(?:,\d{3})+(?:\.\d{2})?)',  # $200,000 or $200,000.00
-            r'\$(\d{3,})',  # $200000
-            r'(\d+),(\d{3})\s*(?:dollars|USD)',  # 200,000 dollars
-        ]
-        
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 try:
                     price_str = match.group(1).replace(',', '')
@@ -287,17 +528,11 @@ class GoogleCSEPropertySearch:
         
         return 0
     
-    def _extract_acres(self, text: str) -> Optional[float]:
+    def _extract_acres(self, text: str, patterns: List["re.Pattern"]) -> Optional[float]:
         """Extract lot size in acres"""
         
-        patterns = [
-            r'([\d.]+)\s*acres?(?:\s|$)',
-            r'(?:lot size|property size)[\s:]*([0-9.]+)\s*acres?',
-            r'([\d.]+)\s*(?:ac|acre)(?:\s|$)',
-        ]
-        
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 try:
                     acres = float(match.group(1))
@@ -323,27 +558,7 @@ class GoogleCSEPropertySearch:
     def _identify_source(self, domain: str) -> str:
         """Identify property source from domain"""
         
-        domain_lower = domain.lower()
-        
-        sources = {
-            'zillow': 'Zillow',
-            'realtor.com': 'Realtor.com',
-            'redfin': 'Redfin',
-            'landwatch': 'LandWatch',
-            'loopnet': 'LoopNet',
-            'facebook': 'Facebook',
-            'craigslist': 'Craigslist',
-            'trulia': 'Trulia',
-            'mls': 'MLS',
-            'county': 'County Records'
-        }
-        
-        for key, name in sources.items():
-            if key in domain_lower:
-                return name
-        
-        # Return domain name
-        return domain.split('.')[0].title()
+        return _source_for_domain(domain)
     
     def _calculate_confidence(
         self,
@@ -373,22 +588,24 @@ class GoogleCSEPropertySearch:
         else:
             return 'Low'
     
-    def _deduplicate_results(self, results: List[Dict]) -> List[Dict]:
-        """Remove duplicate properties"""
+    def _deduplicate_results(
+        self,
+        results: List[PropertyResult],
+        seen: Optional[set] = None
+    ) -> List[PropertyResult]:
+        """Remove duplicate properties (pass the same seen set to dedupe across batches)"""
         
-        seen = {}
+        if seen is None:
+            seen = set()
         unique = []
         
         for result in results:
-            address = result.get('address', '').lower().strip()
-            price = result.get('price', 0)
-            
-            # Create identifier (normalize address)
-            address_normalized = re.sub(r'\s+', ' ', address)
-            key = f"{address_normalized}|{price}"
+            # Identifier: whitespace-normalized address + price (split/join, no regex)
+            key = (' '.join(result.address.lower().split()), result.price)
+            if key in seen:
+                continue
             
-            if key not in seen:
-                seen[key] = True
-                unique.append(result)
+            seen.add(key)
+            unique.append(result)
         
         return unique
\ No newline at end of file
@@ -1,29 +1,53 @@
 """FastAPI Main with Integrated File Generation"""
 
-from fastapi.responses import Response, JSONResponse
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi.responses import Response, JSONResponse, StreamingResponse
+from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Dict, List, Literal, Optional
 from contextlib import asynccontextmanager
 import os
+import asyncio
 import json
+import logging
+import re
 import base64
+import hashlib
+from collections import OrderedDict
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from app.core.security import verify_internal_api_key
+from app.core.logger import setup_logger, shutdown_logger
+from app.core.context import UserContext
+
+logger = logging.getLogger(__name__)
 
 # Global variables
 context_manager = None
 deal_hunter_agent = None
 file_generation_service = None
 
+# file type -> (FileGenerationService method, MIME type)
+FILE_TYPES = {
+    'excel': ('generate_excel', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'word': ('generate_word', "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    'powerpoint': ('generate_powerpoint', "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+    'pdf': ('generate_pdf', "application/pdf"),
+}
+
+# (file type, report data hash) -> (file bytes, filename, base64 data), LRU
+FILE_CACHE_SIZE = 128
+_file_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global context_manager, deal_hunter_agent, file_generation_service
     
+    setup_logger()
+    
     print("🚀 AI Service Starting...")
     
     from app.core.context import ContextManager
@@ -42,6 +66,8 @@ async def lifespan(app: FastAPI):
     yield
     
     print("👋 AI Service Shutting Down...")
+    await deal_hunter_agent.close()
+    shutdown_logger()
 
 app = FastAPI(
     title="AI Real Estate Investment Assistant",
@@ -63,6 +89,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Money strings like "$50,000" -> "50000"
+_MONEY_STRIP_RE = re.compile(r'[$,\s]')
+_PROFILE_NUMERIC_FIELDS = ('startingCapital', 'profitGoal')
+
+def _money_to_float(value) -> float:
+    """Convert a number or money string to float (0.0 when empty or unparseable)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(_MONEY_STRIP_RE.sub('', value) or 0)
+        except ValueError:
+            return 0.0
+    return 0.0
+
 # Models with Pydantic V2
 class UserProfile(BaseModel):
     propertyType: str
@@ -77,17 +118,7 @@ class UserProfile(BaseModel):
     @classmethod
     def convert_to_float(cls, v):
         """Convert string numbers to float"""
-        if v is None:
-            return 0.0
-        if isinstance(v, (int, float)):
-            return float(v)
-        if isinstance(v, str):
-            try:
-                clean = v.replace('$', '').replace(',', '').strip()
-                return float(clean) if clean else 0.0
-            except (ValueError, AttributeError):
-                return 0.0
-        return 0.0
+        return _money_to_float(v)
 
 class ChatMessage(BaseModel):
     userId: str
@@ -105,17 +136,10 @@ class ChatMessage(BaseModel):
         
         normalized = v.copy()
         
-        for field in ['startingCapital', 'profitGoal']:
-            if field in normalized:
-                val = normalized[field]
-                if isinstance(val, str):
-                    try:
-                        clean = val.replace('$', '').replace(',', '').strip()
-                        normalized[field] = float(clean) if clean else 0.0
-                    except (ValueError, AttributeError):
-                        normalized[field] = 0.0
-                elif val is None:
-                    normalized[field] = 0.0
+        # Numbers pass through untouched; strings and None become floats
+        for field in _PROFILE_NUMERIC_FIELDS:
+            if field in normalized and not isinstance(normalized[field], (int, float)):
+                normalized[field] = _money_to_float(normalized[field])
         
         return normalized
 
@@ -123,6 +147,14 @@ class OnboardingRequest(BaseModel):
     userId: str
     profile: UserProfile
 
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    op: Literal["onboarding", "chat"]
+    body: dict
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(min_length=1, max_length=20)
+
 # Routes
 @app.get("/")
 async def root():
@@ -152,7 +184,7 @@ async def onboarding(
     try:
         context_manager.set_user_context(
             user_id=request.userId,
-            profile=request.profile.dict()
+            profile=request.profile.model_dump()
         )
         
         return {
@@ -161,47 +193,91 @@ async def onboarding(
             "userId": request.userId
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Onboarding failed for user %s", request.userId)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _file_cache_key(file_type: str, file_data: dict) -> tuple:
+    """Cache key for a report: its type plus a hash of the data it is built from"""
+    # generated_at changes every request but never reaches the file
+    payload = {k: v for k, v in file_data.items() if k != 'generated_at'}
+    digest = hashlib.blake2b(
+        json.dumps(payload, sort_keys=True, default=str).encode(),
+        digest_size=16
+    ).digest()
+    return file_type, digest
+
+def _build_file(method_name: str, file_data: dict) -> tuple:
+    """Generate and base64-encode a report (CPU-bound, runs in a worker thread)"""
+    file_content, filename = getattr(file_generation_service, method_name)(file_data)
+    return file_content, filename, base64.b64encode(file_content).decode('utf-8')
+
+async def _generate_file(file_type: str, file_data: dict) -> tuple:
+    """Build a report file, or reuse an identical one: (file bytes, filename, base64 data)"""
+    if file_type not in FILE_TYPES:
+        raise ValueError(f"Unknown file type: {file_type}")
+    
+    key = _file_cache_key(file_type, file_data)
+    cached = _file_cache.get(key)
+    if cached is not None:
+        _file_cache.move_to_end(key)
+        logger.debug("File cache hit: %s", cached[1])
+        return cached
+    
+    # openpyxl/python-docx/reportlab work stays off the event loop
+    method_name, _ = FILE_TYPES[file_type]
+    entry = await asyncio.to_thread(_build_file, method_name, file_data)
+    
+    _file_cache[key] = entry
+    if len(_file_cache) > FILE_CACHE_SIZE:
+        _file_cache.popitem(last=False)
+    
+    return entry
+
+def _prepare_session(request: ChatMessage) -> UserContext:
+    """Store the request profile and make sure user context and session exist"""
+    # Store profile if provided
+    if request.userProfile:
+        context_manager.set_user_context(
+            user_id=request.userId,
+            profile=request.userProfile
+        )
+    
+    # Get or create user context
+    user_context = context_manager.get_user_context(request.userId)
+    if user_context is None:
+        context_manager.set_user_context(request.userId, {})
+        user_context = context_manager.get_user_context(request.userId)
+    
+    # Create session if needed
+    if context_manager.get_session(request.userId, request.sessionId) is None:
+        context_manager.create_session(
+            request.userId,
+            request.sessionId,
+            request.agentType
+        )
+    
+    return user_context
+
 @app.post("/api/chat")
 async def chat(
     request: ChatMessage,
-    authorized: bool = Depends(verify_internal_api_key)
+    authorized: bool = Depends(verify_internal_api_key),
+    accept: Optional[str] = Header(None)
 ):
     """
     Handle chat with memory and intelligent file generation
     
-    Return JSON with base64-encoded file data instead of binary Response
+    Return JSON with base64-encoded file data, or the raw file bytes when the
+    client sends Accept: application/octet-stream
     """
     try:
-        # Store profile if provided
-        if request.userProfile:
-            context_manager.set_user_context(
-                user_id=request.userId,
-                profile=request.userProfile
-            )
-        
-        # Get or create user context
-        user_context = context_manager.get_user_context(request.userId)
-        if not user_context:
-            context_manager.set_user_context(request.userId, {})
-            user_context = context_manager.get_user_context(request.userId)
-        
-        # Create session if needed
-        if request.sessionId not in user_context.get("sessions", {}):
-            context_manager.create_session(
-                request.userId,
-                request.sessionId,
-                request.agentType
-            )
+        user_context = _prepare_session(request)
         
         # Get user profile
-        user_profile = user_context.get("profile", {})
+        user_profile = user_context.profile
         
         # Process message with agent (includes web search)
-        print("🧠 Processing message with Deal Hunter agent...")
+        logger.debug("Processing message with Deal Hunter agent")
         response_text = await deal_hunter_agent.process_message(
             request.userId,
             request.sessionId,
@@ -219,7 +295,7 @@ async def chat(
         )
         
         if should_generate and file_type:
-            print(f"📁 File generation requested: {file_type}")
+            logger.info("File generation requested: %s", file_type)
             
             try:
                 # Extract all data for file generation
@@ -229,34 +305,30 @@ async def chat(
                     search_results
                 )
                 
-                # Generate file
-                if file_type == 'excel':
-                    file_content, filename = file_generation_service.generate_excel(file_data)
-                    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                # Generate file (identical reports reuse the cached bytes + base64)
+                file_content, filename, file_base64 = await _generate_file(file_type, file_data)
+                media_type = FILE_TYPES[file_type][1]
                 
-                elif file_type == 'word':
-                    file_content, filename = file_generation_service.generate_word(file_data)
-                    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                
-                elif file_type == 'powerpoint':
-                    file_content, filename = file_generation_service.generate_powerpoint(file_data)
-                    media_type = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                    
-                elif file_type == 'pdf':
-                   file_content, filename = file_generation_service.generate_pdf(file_data)
-                   media_type = "application/pdf"
-                
-                else:
-                    raise ValueError(f"Unknown file type: {file_type}")
-                
-                print(f"✅ Generated {filename} ({len(file_content)} bytes)")
+                logger.info("Generated %s (%d bytes)", filename, len(file_content))
                 
                 #Generate concise response text
                 concise_response = file_generation_service.generate_file_response_text(file_data, file_type)
                 
-                #Return JSON with base64-encoded file
-                file_base64 = base64.b64encode(file_content).decode('utf-8')
+                # Binary clients get the bytes directly, the text goes in headers
+                # (filename percent-encoded, response text base64, both header-safe)
+                if accept and "application/octet-stream" in accept:
+                    return Response(
+                        content=file_content,
+                        media_type=media_type,
+                        headers={
+                            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+                            "X-Filename": quote(filename),
+                            "X-Response-Text": base64.b64encode(concise_response.encode()).decode('ascii'),
+                            "X-Session-Id": request.sessionId
+                        }
+                    )
                 
+                #Return JSON with base64-encoded file
                 return JSONResponse(content={
                     "success": True,
                     "response": concise_response,
@@ -270,9 +342,7 @@ async def chat(
                 })
                 
             except Exception as e:
-                print(f"⚠️ File generation error: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("File generation failed (%s)", file_type)
                 
                 # Return text response with error note
                 response_text += f"\n\n---\n\n⚠️ File generation encountered an issue: {str(e)}\n\nPlease ensure you've provided all necessary information."
@@ -288,10 +358,79 @@ async def chat(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat request failed for user %s", request.userId)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/chat/stream")
+async def chat_stream(
+    request: ChatMessage,
+    authorized: bool = Depends(verify_internal_api_key)
+):
+    """Handle chat with the agent response streamed as server-sent events"""
+    try:
+        user_context = _prepare_session(request)
+        user_profile = user_context.profile
+    except Exception as e:
+        logger.exception("Chat stream setup failed for user %s", request.userId)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        deal_hunter_agent.process_message_stream(
+            request.userId,
+            request.sessionId,
+            request.message,
+            user_profile if user_profile else None
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _run_batch_item(item: BatchItem) -> dict:
+    """Run one batched operation through its endpoint handler: {id, status, body}"""
+    try:
+        if item.op == "onboarding":
+            result = await onboarding(OnboardingRequest.model_validate(item.body), authorized=True)
+        else:
+            result = await chat(ChatMessage.model_validate(item.body), authorized=True, accept=None)
+        
+        # File replies come back as a ready JSONResponse
+        if isinstance(result, Response):
+            result = json.loads(result.body)
+        
+        return {"id": item.id, "status": 200, "body": result}
+    except ValidationError as e:
+        return {"id": item.id, "status": 422, "body": {"detail": json.loads(e.json(include_url=False))}}
+    except HTTPException as e:
+        return {"id": item.id, "status": e.status_code, "body": {"detail": e.detail}}
+
+@app.post("/api/batch")
+async def batch(
+    request: BatchRequest,
+    authorized: bool = Depends(verify_internal_api_key)
+):
+    """
+    Run several onboarding/chat operations in one HTTP request
+    
+    Operations for the same user run in order (onboarding before chat);
+    different users run concurrently. Responses keep the request order.
+    """
+    by_user: Dict[str, List[int]] = {}
+    for i, item in enumerate(request.requests):
+        by_user.setdefault(str(item.body.get("userId", "")), []).append(i)
+    
+    responses: List[Optional[dict]] = [None] * len(request.requests)
+    
+    async def run_in_order(indices: List[int]):
+        for i in indices:
+            responses[i] = await _run_batch_item(request.requests[i])
+    
+    await asyncio.gather(*(run_in_order(indices) for indices in by_user.values()))
+    
+    return {
+        "success": True,
+        "responses": responses
+    }
+
 @app.get("/api/history/{user_id}/{session_id}")
 async def get_history(
     user_id: str,
@@ -311,10 +450,12 @@ async def get_history(
 
 if __name__ == "__main__":
     import uvicorn
+    # Auto-reload only for local development (ENV=dev); loop/http stay on "auto",
+    # which picks uvloop/httptools wherever they are installed (not on Windows)
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=os.getenv("ENV") == "dev",
         log_level="warning"
     )
\ No newline at end of file
@@ -2,6 +2,8 @@
 Core Prompt - Base Instructions for All Agents
 """
 
+from functools import lru_cache
+
 CORE_SYSTEM_INSTRUCTIONS = """You are part of Deal Hunter, an enterprise-grade real estate investment platform.
 
 # Core Principles
@@ -69,4 +71,18 @@ def build_context(user_profile: dict) -> str:
         targetGeography=user_profile.get('targetGeography', 'Not specified'),
         investmentTimeline=user_profile.get('investmentTimeline', 'Not specified'),
         profitGoal=profit_goal_formatted
-    )
\ No newline at end of file
+    )
+
+@lru_cache(maxsize=256)
+def _build_context_from_items(profile_items: frozenset) -> str:
+    return build_context(dict(profile_items))
+
+def build_context_cached(user_profile: dict) -> str:
+    """build_context memoized on the profile contents (profiles rarely change between turns)"""
+    if not user_profile:
+        return ""
+    try:
+        return _build_context_from_items(frozenset(user_profile.items()))
+    except TypeError:
+        # Unhashable profile values - render directly
+        return build_context(user_profile)
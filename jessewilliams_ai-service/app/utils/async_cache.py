@@ -0,0 +1,67 @@
+"""
+Async TTL Cache - Memoizes coroutine results for a limited time
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+def async_ttl_cache(maxsize: int = 512, ttl: float = 600.0):
+    """
+    Cache an async function's results per argument tuple, LRU-bounded and expiring after ttl seconds
+    
+    Concurrent calls with the same arguments share one in-flight call (single-flight). The
+    call survives the cancellation of any caller while another is still waiting on it, and
+    is cancelled together with the last one so abandoned work doesn't keep running. Empty results
+    (None, [], {}) and exceptions are not cached so a failed upstream call is retried next time.
+    """
+    def decorator(func: Callable):
+        cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        in_flight: Dict[Tuple, "asyncio.Future"] = {}
+        waiters: Dict["asyncio.Future", int] = {}
+        
+        def store(key: Tuple, task: "asyncio.Future"):
+            in_flight.pop(key, None)
+            if task.cancelled() or task.exception() is not None:
+                return
+            
+            result = task.result()
+            if result:
+                cache[key] = (time.monotonic() + ttl, result)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            
+            entry = cache.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    cache.move_to_end(key)
+                    return entry[1]
+                del cache[key]
+            
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[key] = task
+                task.add_done_callback(functools.partial(store, key))
+            
+            waiters[task] = waiters.get(task, 0) + 1
+            try:
+                return await asyncio.shield(task)
+            finally:
+                waiters[task] -= 1
+                if not waiters[task]:
+                    del waiters[task]
+                    # Only reachable unfinished when the last waiter was cancelled
+                    if not task.done():
+                        task.cancel()
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    
+    return decorator
@@ -13,6 +13,7 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import io
 import xlsxwriter
 from datetime import datetime
+from app.core.context import UserContext
 
 # Word (python-docx) imports
 from docx import Document
@@ -73,7 +74,7 @@ class FileGenerationService:
      
     @staticmethod
     def extract_data_from_context(
-     user_context: Dict,
+     user_context: UserContext,
      session_id: str,
      search_results: Optional[List[Dict]] = None) -> Dict:
      """
@@ -81,9 +82,9 @@ class FileGenerationService:
      NOW HANDLES PDF + Validates search results
      """
     
-     profile = user_context.get("profile", {})
-     session = user_context.get("sessions", {}).get(session_id, {})
-     extracted = session.get("extracted_data", {})
+     profile = user_context.profile
+     session = user_context.sessions.get(session_id)
+     extracted = session.extracted_data if session is not None else {}
     
     # Helper to convert to float safely
      def to_float(val, default=0.0):
@@ -120,6 +121,9 @@ class FileGenerationService:
     
      print(f"✅ Validated {len(validated_results)} search results for file generation")
     
+    # One clock read for both date fields
+     now = datetime.now()
+    
     # Gather all data
      data = {
         # User profile - REAL DATA ONLY
@@ -136,8 +140,8 @@ class FileGenerationService:
         'search_results': validated_results,
         
         # Metadata
-        'date': datetime.now().strftime('%B %d, %Y'),
-        'generated_at': datetime.now().isoformat(),
+        'date': now.strftime('%B %d, %Y'),
+        'generated_at': now.isoformat(),
      }
     
     # Calculate projections ONLY if we have real capital data
@@ -3,8 +3,14 @@ Response Formatting with Tables & Professional Structure
 """
 
 import random
+import re
+from itertools import cycle
 from typing import List, Dict, Any
 
+# Section starts (markdown headers / emoji markers) and runs of blank lines
+_SECTION_START_RE = re.compile(r'\n(#{1,6}|[🎯💼📊🏘️💰⚠️📋⭐])')
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
 class ResponseFormatter:
     """Enterprise-grade response formatting"""
     
@@ -22,8 +28,8 @@ class ResponseFormatter:
     
     @staticmethod
     def get_greeting() -> str:
-        """Get random greeting to avoid repetition"""
-        return random.choice(ResponseFormatter.GREETINGS)
+        """Get the next greeting from a preshuffled rotation to avoid repetition"""
+        return next(_GREETING_CYCLE)
     
     @staticmethod
     def format_currency(amount: float, short: bool = False) -> str:
@@ -141,9 +147,11 @@ Cash Available: {ResponseFormatter.format_currency(capital * 0.95)}
     @staticmethod
     def add_section_spacing(text: str) -> str:
         """Ensure proper spacing between sections"""
-        import re
         # Ensure sections have proper spacing
-        text = re.sub(r'\n(#{1,6}|[🎯💼📊🏘️💰⚠️📋⭐])', r'\n\n\1', text)
+        text = _SECTION_START_RE.sub(r'\n\n\1', text)
         # Remove excessive blank lines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
\ No newline at end of file
+        text = _EXTRA_BLANK_LINES_RE.sub('\n\n', text)
+        return text.strip()
+
+# Shuffled once at import, then rotated
+_GREETING_CYCLE = cycle(random.sample(ResponseFormatter.GREETINGS, len(ResponseFormatter.GREETINGS)))
@@ -0,0 +1,12 @@
+"""
+JSON Utils - Fast JSON decoding shared by the outbound API clients
+"""
+
+import json
+
+# Faster JSON parsing straight from response bytes when orjson is installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
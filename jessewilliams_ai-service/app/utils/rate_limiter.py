@@ -0,0 +1,30 @@
+"""
+Rate Limiter - Token bucket for outbound API calls
+"""
+
+import asyncio
+import time
+
+class RateLimiter:
+    """Token bucket: refills `rate` tokens per second, allows bursts of up to `max_tokens`"""
+    
+    def __init__(self, rate: float = 5.0, max_tokens: int = 10):
+        self.rate = rate
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available, then take it (waiters are served in order)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,33 @@
+"""
+Stream Buffer - Batches streamed text into fewer SSE frames
+"""
+
+import time
+from typing import List, Optional
+
+class StreamBuffer:
+    """Accumulates deltas and releases them by size or flush interval"""
+    
+    def __init__(self, max_size: int = 8192, flush_interval: float = 0.025):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._parts: List[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+    
+    def add(self, text: str) -> Optional[str]:
+        """Append text, returning the batched text when a flush is due"""
+        self._parts.append(text)
+        self._size += len(text)
+        
+        if self._size >= self.max_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return None
+    
+    def flush(self) -> str:
+        """Return everything buffered so far and reset"""
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        return text